@@ -11,7 +11,8 @@ At a glance, the structure of the module is following:
                         creating a pre-dataset before moving on completely to
                         Grakn.AI. Once the use of Grakn is started, this
                         function will most likely be deprecated. The CSV is
-                        stored under the `./data/knowledge/csv/` directory.
+                        stored under the `./data/knowledge/csv/` directory
+                        along with it`s parquet copy.
  - play_music_using_metadata(): Similar to `_play_music` function but instead
                         of playing music from given music file, it plays using
                         the metadata references from the csv file. The use of
@@ -38,18 +39,55 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #           Reduced unnecessary use of "`" in comments for simplicity.
 #   1.0.0 - First code.
 
-from inspect import stack
-from sys import exc_info
-
-from charlotte.utils.assists.generic import find_file, str_match, write_to_csv
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from os import remove, scandir, stat
+from os.path import basename, getmtime, isfile, join
+from pathlib import Path
+from random import choice, randint
+
+from hurry.filesize import alternative, size
+from numpy import logical_and
+from pandas import DataFrame, read_csv, read_parquet
+from tinytag import TinyTag, TinyTagException
+
+from charlotte.utils.assists.generic import find_file, str_match
 from charlotte.utils.assists.profile import lower, title
 from charlotte.utils.assists.system import minimize_window
 from charlotte.utils.paths.directories import local_dir
 from charlotte.utils.paths.files import ai_file
 
+logger = logging.getLogger(__name__)
+
 # Constant used by `play_music_using_metadata` to use default UTF-8 encoding.
 _ENCODING = 'utf-8'
 
+# Columns of the csv file which are searched by `play_music_using_metadata`.
+_SEARCH_COLUMNS = ('track_name', 'track_artist', 'track_albumartist',
+                   'track_composer', 'track_album', 'track_genre',
+                   'track_duration', 'track_year', 'track_filesize')
+
+# Parquet copy of the csv file created by `migrate_music`. It is read by
+# `play_music_using_metadata` instead of the csv file, if it is up to date.
+_MUSIC_STORE = Path(ai_file['music']).with_suffix('.parquet')
+
+
+@lru_cache(maxsize=4096)
+def _read_tag(file: str, mtime: int, file_size: int) -> TinyTag:
+    """Reads music tag.
+
+    file:      Music file whose tag needs to be read.
+    mtime:     Last modification time of the file (in nanoseconds).
+    file_size: Size of the file (in bytes).
+
+    Reads the tag of the music file once & reuses it for the later calls.
+    The modification time & size are part of the cache key, hence the tag
+    is read again only if the file changes.
+    """
+    return TinyTag.get(file)
+
 
 def _extract_metadata(file: str) -> tuple:
     """Extracts music metadata.
@@ -60,15 +98,12 @@ def _extract_metadata(file: str) -> tuple:
     provide necessary information and is recommended to use in conjunction
     with function `play_music_using_metadata`.
     """
-    from os.path import basename, isfile
-    from datetime import timedelta
-    from hurry.filesize import size, alternative
-    from tinytag import TinyTag
-
     try:
         # Execute code if file exists.
         if isfile(file):
-            music_track = TinyTag.get(file)
+            file_stat = stat(file)
+            music_track = _read_tag(file, file_stat.st_mtime_ns,
+                                    file_stat.st_size)
             music_file = basename(file)
             track_name = music_track.title
             track_artist = music_track.artist
@@ -76,16 +111,70 @@ def _extract_metadata(file: str) -> tuple:
             track_composer = music_track.composer
             track_album = music_track.album
             track_genre = music_track.genre
+            # Duration is None if the tag could not be determined.
             track_duration = str(
-                timedelta(seconds=round(music_track.duration)))
+                timedelta(seconds=round(music_track.duration))) \
+                if music_track.duration is not None else None
             track_year = music_track.year
             track_filesize = size(music_track.filesize, system=alternative)
             # Returns all the extracted metadata along with music filename.
             return music_file, track_name, track_artist, track_albumartist, track_composer, track_album, track_genre, track_duration, track_year, track_filesize
         else:
             return f'Sorry {lower}. I could not find any track with the search parameters.'
-    except Exception as error:
-        exception(error)
+    except (OSError, TinyTagException) as error:
+        # Returns None if the file could not be read.
+        logger.debug('Could not extract metadata of %s: %r', file, error)
+
+
+def _extract_metadata_many(files: list, workers: int = 8) -> list:
+    """Extracts metadata of multiple music files.
+
+    files:   List of music files whose metadata needs to be extracted.
+    workers: Number of files to be read simultaneously.
+             Default: 8
+
+    Similar to `_extract_metadata` function but the files are read in
+    parallel, hence the disk reads of one file overlap with the others.
+    The metadata is returned in the same order as the files.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_extract_metadata, files))
+
+
+@lru_cache(maxsize=1)
+def _load_music(file: str, mtime: float) -> tuple:
+    """Loads csv of music files.
+
+    file:  Name of the csv or parquet file which has the music metadata.
+    mtime: Last modification time of the file. It is part of the cache
+           key, hence the file is read again only once it changes.
+
+    Reads the file created by `migrate_music` along with the unique
+    values of each searchable column as strings, both as a tuple for
+    fuzzy matching and as a frozenset for exact lookups. These are kept in
+    memory and reused by `play_music_using_metadata` instead of reading the
+    file per request.
+
+    Note: The returned dataframe is shared between the callers, hence it
+    should not be modified.
+    """
+    if Path(file).suffix == '.parquet':
+        df = read_parquet(file)
+    else:
+        # Searchable columns are read as strings, else pandas parses the
+        # numeric looking ones like `track_year` as floats (`2019.0`) while
+        # the parquet copy has them as written (`2019`).
+        df = read_csv(file, encoding=_ENCODING,
+                      dtype={column: str for column in _SEARCH_COLUMNS})
+    # Searchable columns are kept as strings, since the slots are strings
+    # and the fuzzy matching works only with strings. Missing values are
+    # left as it is.
+    df = df.assign(**{column: df[column].astype(str).where(df[column].notna())
+                      for column in _SEARCH_COLUMNS})
+    values = {column: tuple(df[column].dropna().unique())
+              for column in _SEARCH_COLUMNS}
+    lookups = {column: frozenset(values[column]) for column in values}
+    return df, values, lookups
 
 
 def migrate_music(file_dir: str = local_dir['music']) -> None:
@@ -113,33 +202,54 @@ def migrate_music(file_dir: str = local_dir['music']) -> None:
 
     Caution: Once the use of Grakn.AI is started, this function will most
     likely be deprecated. The CSV is stored under the `./data/knowledge/csv/`
-    directory.
+    directory along with it`s parquet copy, which is used while looking up
+    the tracks.
     """
-    from os import remove, walk
-    from os.path import isfile, join
-
     try:
         # List of all headers in the csv file.
         header_list = ['music_file', 'track_name', 'track_artist',
                        'track_albumartist', 'track_composer', 'track_album',
                        'track_genre', 'track_duration', 'track_year',
                        'track_filesize']
-        # Deletes if the previous csv file exists.
+        # Deletes if the previous csv & parquet files exist.
         # This is to avoid data duplication.
-        if isfile(ai_file['music']):
-            remove(ai_file['music'])
-        for _, _, files in walk(file_dir):
-            for file in files:
-                # Extracting metadata information from the music files and
-                music_file, track_name, track_artist, track_albumartist, track_composer, track_album, track_genre, track_duration, track_year, track_filesize = _extract_metadata(
-                    join(local_dir['music'], file))
-                # Writing it in csv file.
-                write_to_csv(ai_file['music'], music_file, track_name,
-                             track_artist, track_albumartist, track_composer,
-                             track_album, track_genre, track_duration,
-                             track_year, track_filesize)
-    except Exception as error:
-        exception(error)
+        for old_file in (ai_file['music'], _MUSIC_STORE):
+            if isfile(old_file):
+                remove(old_file)
+        # Listing the music files directly under the directory. Only these
+        # are migrated since the tracks are played by their file name from
+        # the same directory.
+        with scandir(file_dir) as entries:
+            music_files = [entry.path for entry in entries if entry.is_file()]
+        # Extracting metadata information from the music files. Files whose
+        # metadata could not be extracted are skipped.
+        rows = [metadata for metadata in _extract_metadata_many(music_files)
+                if isinstance(metadata, tuple)]
+        # Writing it in csv file along with a parquet copy, which is faster
+        # to read. Nothing is written if no music file is found.
+        if rows:
+            df = DataFrame(rows, columns=header_list)
+            df.to_csv(ai_file['music'], index=False, encoding=_ENCODING)
+            df.to_parquet(_MUSIC_STORE)
+    except OSError as error:
+        logger.debug('Could not migrate music from %s: %r', file_dir, error)
+        raise
+
+
+def _start_track(music_file: str) -> None:
+    """Starts playing the music file.
+
+    music_file: Exact path of the music file that needs to be played.
+
+    Plays the music file as is, without guessing it`s name from the music
+    directory & returns it`s metadata.
+    """
+    # `os.startfile` is available on Windows only, hence it is imported
+    # here so that the module can still be imported on other platforms.
+    from os import startfile
+    startfile(music_file)
+    minimize_window('Groove Music')
+    return _extract_metadata(music_file)
 
 
 def _play_music(file: str = None, file_dir: str = local_dir['music']) -> None:
@@ -156,10 +266,6 @@ def _play_music(file: str = None, file_dir: str = local_dir['music']) -> None:
     Note: If no music selection/file is provided, the function will start
     playing music automatically at random from the default music directory.
     """
-    from os import startfile, listdir
-    from os.path import isfile, join
-    from random import choice
-
     try:
         # If music file name is provided then play that music file, else play
         # any random music file from the default music directory.
@@ -172,15 +278,19 @@ def _play_music(file: str = None, file_dir: str = local_dir['music']) -> None:
             else:
                 music_file = join(file_dir, file_name)
         else:
-            # Randomly chooses file from the default music directory.
-            music_file = choice([join(local_dir['music'], file) for file in listdir(
-                local_dir['music']) if isfile(join(local_dir['music'], file))])
-        # Plays the music file.
-        startfile(music_file)
-        minimize_window('Groove Music')
-        return _extract_metadata(music_file)
-    except Exception as error:
-        exception(error)
+            # Randomly chooses file from the music directory. Directory
+            # entries already know their type, hence no extra stat call is
+            # made for each file.
+            with scandir(file_dir) as entries:
+                music_files = [entry.path for entry in entries
+                               if entry.is_file()]
+            if not music_files:
+                return f'Sorry {lower}. There is no track to play.'
+            music_file = choice(music_files)
+        return _start_track(music_file)
+    except OSError as error:
+        logger.debug('Could not play %s: %r', file, error)
+        raise
 
 
 def play_music_using_metadata(music_file: str = None,
@@ -212,86 +322,98 @@ def play_music_using_metadata(music_file: str = None,
     Note: The use of csv file for pulling information will soon get deprecated
     and will be replaced with Grakn.AI.
 
-    Caution: All values are None by default. This will ensure, no value is
-    passed to the `_play_music` function inside it. No input to `_play_music`
-    will play file randomly.
+    Caution: All values are None by default. If no value is given, a music
+    file is played at random from the music directory.
     """
-    from os import walk
-    from random import randint
-    from numpy import ones
-    from pandas import read_csv, Series
-
     try:
-        # Generating a list of all the tracks inside the directory.
-        for _, _, track_list in walk(local_dir['music']):
-            pass
-        # If music file is given, find it`s relative previous and next track.
-        if music_file:
-            # This generated track list is used for finding the relative next
-            # and previous tracks.
-            previous_track = track_list[track_list.index(
-                str_match(music_file, track_list)) - 1]
-            next_track = track_list[track_list.index(
-                str_match(music_file, track_list)) + 1]
-            playing_file = _play_music(music_file)
-            return playing_file, previous_track, next_track
-        elif track_name:
-            # Added support for previous and next track since the inputs come
-            # from a Slot, track_name.
-            previous_track = track_list[track_list.index(
-                str_match(track_name, track_list)) - 1]
-            next_track = track_list[track_list.index(
-                str_match(track_name, track_list)) + 1]
-            playing_file = _play_music(track_name)
+        # If music file or track name is given, find it`s relative previous
+        # and next track. Added support for track name since the inputs come
+        # from a Slot, track_name.
+        if music_file or track_name:
+            # Generating a list of all the tracks inside the directory. This
+            # list is used for finding the relative next and previous tracks.
+            with scandir(local_dir['music']) as entries:
+                track_list = [entry.name for entry in entries
+                              if entry.is_file()]
+            # The matched track is played as is, hence the track which is
+            # played is the same as the one the previous & next tracks are
+            # relative to.
+            pick = track_list.index(str_match(music_file or track_name,
+                                              track_list))
+            previous_track = track_list[pick - 1]
+            next_track = track_list[(pick + 1) % len(track_list)]
+            playing_file = _start_track(join(local_dir['music'],
+                                             track_list[pick]))
             return playing_file, previous_track, next_track
         else:
-            music_csv_file = ai_file['music']
-            # Calling csv object for lookup.
-            df = read_csv(music_csv_file, encoding=_ENCODING)
-            # Creating a master dictionary which has all the filtering
-            # parameters from the given arguments, including None values.
-            master_dict = {
-                'track_name': str_match(track_name, df['track_name'].dropna().tolist()),
-                'track_artist': str_match(track_artist, df['track_artist'].dropna().tolist()),
-                'track_albumartist': str_match(track_albumartist, df['track_albumartist'].dropna().tolist()),
-                'track_composer': str_match(track_composer, df['track_composer'].dropna().tolist()),
-                'track_album': str_match(track_album, df['track_album'].dropna().tolist()),
-                'track_genre': str_match(track_genre, df['track_genre'].dropna().tolist()),
-                'track_duration': str_match(track_duration, df['track_duration'].dropna().tolist()),
-                'track_year': str_match(track_year, df['track_year'].dropna().tolist()),
-                'track_filesize': str_match(track_filesize, df['track_filesize'].dropna().tolist())}
-            # Creating a filtered dictionary with only non-None key-value pair.
-            filtered_dict = {k: v for k,
-                             v in master_dict.items() if v is not None}
-            # Not sure what it does, referred from the internet.
-            # Link to the reference code is to be posted here.
-            filter_series = Series(ones(df.shape[0], dtype=bool))
-            for column, value in filtered_dict.items():
-                filter_series = ((df[column] == value) & filter_series)
+            # Creating a dictionary of only the given search parameters, as
+            # strings like the searchable columns. The track name is never
+            # given here since it is handled above.
+            given = {column: str(value) for column, value in zip(
+                _SEARCH_COLUMNS[1:], (track_artist, track_albumartist,
+                                      track_composer, track_album,
+                                      track_genre, track_duration,
+                                      track_year, track_filesize))
+                     if value is not None}
+            if not given:
+                # If no search parameters are given, it picks music file at
+                # random from the music directory without looking up the
+                # csv file. Only the files directly under the directory are
+                # picked, the same as the ones which are migrated.
+                with scandir(local_dir['music']) as entries:
+                    music_files = [entry.path for entry in entries
+                                   if entry.is_file()]
+                if not music_files:
+                    return f'Sorry {lower}. There is no track to play.'
+                pick = randint(0, len(music_files) - 1)
+                previous_track = basename(music_files[pick - 1])
+                next_track = basename(music_files[(pick + 1) %
+                                                  len(music_files)])
+                playing_file = _start_track(music_files[pick])
+                return playing_file, previous_track, next_track
+            music_csv_file = Path(ai_file['music'])
+            # The parquet copy is used only if it is not older than the csv
+            # file, hence the changes made to the csv file are not missed.
+            if _MUSIC_STORE.is_file() and (
+                    not music_csv_file.is_file() or
+                    getmtime(_MUSIC_STORE) >= getmtime(music_csv_file)):
+                music_csv_file = _MUSIC_STORE
+            # Calling csv object for lookup, this is read only if the file
+            # has changed since the last request.
+            df, values, lookups = _load_music(str(music_csv_file),
+                                              getmtime(music_csv_file))
+            # Creating a filtered dictionary which has the filtering values
+            # for the given search parameters only. Values which exactly
+            # match the column are used without the fuzzy matching.
+            filtered_dict = {column: value if value in lookups[column] else
+                             str_match(value, values[column])
+                             for column, value in given.items()}
+            # Boolean mask of the rows which match all the given filters.
+            # The comparisons are made on the underlying arrays & reduced
+            # in one go instead of building a new series for each filter.
+            mask = logical_and.reduce([df[column].values == value
+                                       for column, value
+                                       in filtered_dict.items()])
+            matches = df[mask]
+            total = len(matches)
             # Generating track list which is used for finding the relative next
             # and previous tracks from the filtered dictionary.
-            track_list = df[filter_series]['music_file'].tolist()
-            if len(df[filter_series]) > 1:
-                # If more than one track is returned after applying all the
-                # filters, it picks music file at random along with returning
-                # previous and next tracks.
-                random_pick = df[filter_series].iloc[randint(
-                    0, len(df[filter_series])), 0]
-                previous_track = track_list[track_list.index(random_pick) - 1]
-                next_track = track_list[track_list.index(random_pick) + 1]
-                playing_file = _play_music(random_pick)
-                return playing_file, previous_track, next_track
-            elif len(df[filter_series]) == 1:
-                # If only one value is received after applying all filters.
-                current_pick = df[filter_series].iloc[0, 0]
-                previous_track = track_list[track_list.index(current_pick) - 1]
-                next_track = track_list[track_list.index(current_pick) + 1]
-                playing_file = _play_music(current_pick)
+            track_list = matches['music_file'].tolist()
+            if total:
+                # Picks music file at random from the tracks returned after
+                # applying all the filters along with returning previous and
+                # next tracks. With a single track, it is picked as is.
+                pick = randint(0, total - 1)
+                previous_track = track_list[pick - 1]
+                next_track = track_list[(pick + 1) % total]
+                playing_file = _start_track(join(local_dir['music'],
+                                                 track_list[pick]))
                 return playing_file, previous_track, next_track
             else:
                 return f'Sorry {lower}. I could not find any track with the search parameters.'
-    except Exception as error:
-        exception(error)
+    except (IndexError, KeyError, OSError, ValueError) as error:
+        logger.debug('Could not find the track to play: %r', error)
+        raise
 
 
 def reply_on_playing(file_name: str = None,
@@ -308,9 +430,6 @@ def reply_on_playing(file_name: str = None,
 
     Caution: All values are None by default.
     """
-    from pathlib import Path
-    from random import choice
-
     # Returns file name without extension.
     file_name = Path(file_name).stem
     with_file_name = [f'Alright, playing {file_name}.',
@@ -339,22 +458,19 @@ def reply_on_playing(file_name: str = None,
                          'the search parameters.',
                          f'Sorry {lower}. I could not find any match for'
                          ' the playing track.']
-    try:
-        # If no track is detected after passing multiple parameters and random
-        # is not played, it returns below choice.
-        if len(file_name) == 1 and file_name == 'S':
-            return choice(without_file_name)
-        else:
-            # If valid details are provided, it returns respective choice.
-            if track_artist is None:
-                if track_name is None:
-                    return choice(with_file_name)
-                else:
-                    return choice(with_track_name)
+    # If no track is detected after passing multiple parameters and random
+    # is not played, it returns below choice.
+    if len(file_name) == 1 and file_name == 'S':
+        return choice(without_file_name)
+    else:
+        # If valid details are provided, it returns respective choice.
+        if track_artist is None:
+            if track_name is None:
+                return choice(with_file_name)
             else:
-                return choice(both_details)
-    except Exception as error:
-        exception(error)
+                return choice(with_track_name)
+        else:
+            return choice(both_details)
 
 
 def play_next_track(next_track: str) -> None:
@@ -365,15 +481,12 @@ def play_next_track(next_track: str) -> None:
     Plays next track in queue. This makes sure there is always something to
     play if next track is requested.
     """
-    try:
-        # If no input is given, it will return no track to play response.
-        if next_track is None:
-            return f'Sorry {lower}. There is no track to play.'
-        else:
-            return play_music_using_metadata(music_file=next_track,
-                                             track_name=next_track)
-    except Exception as error:
-        exception(error)
+    # If no input is given, it will return no track to play response.
+    if next_track is None:
+        return f'Sorry {lower}. There is no track to play.'
+    else:
+        return play_music_using_metadata(music_file=next_track,
+                                         track_name=next_track)
 
 
 def play_previous_track(previous_track: str) -> None:
@@ -384,12 +497,9 @@ def play_previous_track(previous_track: str) -> None:
     Similar to `play_next_track`, plays previous track relative to the current
     track.
     """
-    try:
-        # If no input is given, it will return no track to play response.
-        if previous_track is None:
-            return f'Sorry {lower}. There is no track to play.'
-        else:
-            return play_music_using_metadata(music_file=previous_track,
-                                             track_name=previous_track)
-    except Exception as error:
-        exception(error)
+    # If no input is given, it will return no track to play response.
+    if previous_track is None:
+        return f'Sorry {lower}. There is no track to play.'
+    else:
+        return play_music_using_metadata(music_file=previous_track,
+                                         track_name=previous_track)
@@ -33,11 +33,18 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #   1.0.2 - Reduced unnecessary use of "`" in comments for simplicity.
 #   1.0.0 - First code.
 
+from bisect import bisect_right
+from datetime import datetime
+from random import choice
 from typing import Text
 
 from charlotte.utils.constants import DARK, DAWN, DUSK, NOON
 from charlotte.utils.phrases import greet
 
+# Hours at which each part of the day starts & it`s respective greeting.
+_HOURS_OF_DAY = (DAWN, NOON, DUSK, DARK)
+_GREETINGS = ('night', 'morning', 'afternoon', 'evening', 'night')
+
 
 def greet_user() -> Text:
     """Greets user.
@@ -47,17 +54,7 @@ def greet_user() -> Text:
     Note: These responses needs to be expanded in future. The greeting
     is returned on the basis of the current hour.
     """
-    from datetime import datetime
-    from random import choice
-
-    hour = datetime.now().hour
-    morning = choice(greet['morning'])
-    afternoon = choice(greet['afternoon'])
-    evening = choice(greet['evening'])
-    night = choice(greet['night'])
     # Determining which greeting should be used.
-    greeting = morning if hour >= DAWN and hour < NOON else \
-        afternoon if hour >= NOON and hour < DUSK else \
-        evening if hour >= DUSK and hour < DARK else night
+    greeting = _GREETINGS[bisect_right(_HOURS_OF_DAY, datetime.now().hour)]
     # Returns greetings as per the day & current time-hour-minutes.
-    return greeting
+    return choice(greet[greeting])
@@ -50,23 +50,157 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #           function.
 #   1.0.0 - First code.
 
-from inspect import stack
-from sys import exc_info
-from typing import Optional, Text, Tuple, Union
+import logging
+import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from random import choice
+from time import time
+from typing import Dict, Optional, Text, Tuple, Union
 
-from charlotte.utils.assists.constants import DARK, DAWN, DUSK, NOON
-from charlotte.utils.assists.system import check_internet, resolve_days
+from geocoder import osm
+from googlemaps import Client
+from googlemaps.exceptions import ApiError, Timeout, TransportError
+from requests import RequestException, Session
 
+from charlotte.utils.assists.constants import (DARK, DAWN, DUSK, NOON,
+                                               WEATHER_TTL)
+from charlotte.utils.assists.system import resolve_days
 
-def _get_coords(location: Optional[Text] = None) -> Tuple:
+logger = logging.getLogger(__name__)
+
+# Session used for the DarkSky API calls. It keeps the connection alive
+# between the calls instead of connecting again on every request.
+_SESSION = Session()
+
+# Hours at which each part of the day starts & it`s respective names.
+_HOURS_OF_DAY = (DAWN, NOON, DUSK, DARK)
+_PARTS_OF_DAY = (('night',), ('morning', 'day'), ('afternoon', 'day'),
+                 ('evening',), ('night',))
+
+# Responses used by `forecast` for the days, hours & current weather.
+# These are formatted only once the response is chosen.
+_DAYS = ('For the next {days} {pl} there are some places in '
+         '{loc} that will be {cond}. Interestingly, there would '
+         'be {fore}',
+         'Well it does look as if we\'ll see more {cond} across '
+         '{loc} for the next {days} {pl}. More so there will be '
+         '{fore}',
+         'Some parts of {loc} will be seeing a bit of {cond} for '
+         'the next {days} {pl} with average temperature of {feel}'
+         '. But for the most part it\'ll fluctuate between {max} '
+         'high & {min} low.',
+         'Well for the next {days} {pl}, it seems it\'ll be '
+         'fairly {cond} in some parts of {loc}. Winds can be '
+         'seen gushing at speeds upto {spd} and as we go '
+         'through the week the temperature will vary between '
+         '{max} high & {min} low.',
+         'I could see some {sky} skies over {dir} parts of {loc} '
+         'for the next {days} {pl}. Also we do have some {cond} '
+         'spells with the temperature struggling to be '
+         'about {temp}.',
+         'For {day} it is forecasted that there are some places '
+         'in {loc} that will be {cond}. Interestingly, there '
+         'would be {fore}',
+         'Some parts of {loc} will be seeing a bit of {cond} by '
+         '{day} with average temperature of {feel}. But for the '
+         'most part it\'ll fluctuate between {max} high & '
+         '{min} low.',
+         'Well till {day}, it seems it\'ll be fairly {cond} in '
+         'some parts of {loc}. Winds can be seen gushing at '
+         'speeds upto {spd} and as we go through the week the '
+         'temperature will vary between {max} high & {min} low.')
+
+_HOURS = ('We are going to see {cond} in the next {hours} hours '
+          'with {sky} skies in some parts {loc} with temperature '
+          'fluctuating between {max} high & {min} low.',
+          'There is going to be {cond} here in {loc} for the next '
+          '{hours} hours, also we may experience {sky} skies with '
+          'temperatures spiking upto {temp}.')
+
+_NOW = ('Well, it is {cond} in some places across much of {loc}. '
+        'Having said that the temperature has been around {temp} '
+        'roughly and will stay the same for the most part of the '
+        '{part}.',
+        'It is {cond} in {dir} parts of {loc}. We will however '
+        'see the temperature between {min} & {max}. '
+        'Interestingly, there would be {fore}',
+        'It is {cond} across {dir} {loc} especially in the early '
+        'hours. It\'s the expected humidity of {hum} with the '
+        'unsettling breeze is affecting the average temperature '
+        'of {feel}.',
+        'Looking at {loc} from above, it is {cond}. While some '
+        'of the areas in {dir} {loc} would get as low as {min} '
+        '& as high as {max} because of the humidity.',
+        'Well from above here, it seems it is {cond}. Winds can '
+        'be seen gushing at speeds upto {spd} across {loc} and '
+        'as we go throughout the {part} the temperature will'
+        ' vary between {max} high & {min} low.',
+        'Most likely it is {cond}. However, we could see '
+        'temperature rise upto {temp} over the grounds of {dir} '
+        'parts of {loc}. Interestingly, there would be {fore}',
+        'In the {part} we shall witness {cond} in places across '
+        '{loc}. It\'s a fine start to the {part} but we\'ve got '
+        'some windy weather which should feel relatively pleasant '
+        'with the temperature slightly above {temp}.',
+        'The temperature in {loc} is going to stay between '
+        '{temp} & {feel} all {part} with a bit of {cond} in the '
+        '{dir} parts. However, it\'ll be {fore}')
+
+
+@lru_cache(maxsize=1)
+def _maps_client(key: Text) -> Client:
+    """Returns Google Maps client.
+
+    key: Google Maps API key.
+
+    Creates the client once & reuses it across the calls, hence it`s
+    HTTP session is not created again on every request.
+
+    Note: The client is created again only if the API key changes.
+    """
+    return Client(key=key)
+
+
+@lru_cache(maxsize=128)
+def _locate(location: Optional[Text], window: int) -> Tuple:
+    """Returns cached coords for the asked location.
+
+    location: Location or the address to be converted to latitude and
+              longitude.
+    window:   Time window in which the request is made. It is part of the
+              cache key, hence the cached coords expire once the window
+              changes.
+
+    Returns the coords rounded to 2 decimal places (about 1 km), hence
+    the small changes in the current global position do not change the
+    DarkSky API url.
+
+    Note: Errors raised by the Maps API are never cached.
+    """
+    # Passing Google maps API key.
+    map = _maps_client(os.environ.get('CHARLOTTE_MAPS_KEY'))
+    # Finding current latitude and longitude coordinates.
+    if location:
+        curr = map.geocode(location)[0]['geometry']
+    else:
+        curr = map.geolocate()
+    return (round(curr['location']['lat'], 2),
+            round(curr['location']['lng'], 2))
+
+
+def _get_coords(location: Optional[Text], window: int) -> Tuple:
     """Returns coords for the asked location.
 
     location: Location or the address to be converted to latitude and
               longitude.
-              Default: None
+    window:   Time window in which the request is made.
 
-    Find and returns current global position and the city using reverse
-    lookup via Google Maps API.
+    Find and returns current global position using Google Maps API. The
+    coords are looked up once per `WEATHER_TTL` seconds for the same
+    location.
 
     Note: Function uses Google Maps for retreiving latitude & longitude
     using it`s API. Hence it is necessary to generate the API key first
@@ -74,37 +208,77 @@ def _get_coords(location: Optional[Text] = None) -> Tuple:
     You can generate it here: https://console.developers.google.com
 
     Caution: If you run the function without passing valid API key, it
-    will raise an exception.
+    returns None values.
+    """
+    try:
+        return _locate(location, window)
+    except (ApiError, IndexError, Timeout, TransportError,
+            ValueError) as error:
+        # Returns None values if the location is not found, the API key is
+        # not set or if the Maps API could not be reached.
+        logger.debug('Could not find coords for %s: %r', location, error)
+        return None, None
+
+
+@lru_cache(maxsize=128)
+def _find_area(coords: Tuple, window: int) -> Text:
+    """Returns cached area for the coords.
+
+    coords: Latitude and longitude of the location.
+    window: Time window in which the request is made. It is part of the
+            cache key, hence the cached area expires once the window
+            changes.
+
+    Note: Raises LookupError if no place name is found, hence the failed
+    lookups are never cached.
     """
-    import os
-    from geocoder import osm
-    from googlemaps import Client
+    # Reverse mapping the coordinates to find out the city name. The
+    # response is empty if the lookup fails.
+    area = osm(coords, method='reverse').json or {}
+    loc_list = ['city', 'town', 'suburb', 'state', 'region', 'country']
+    for idx in loc_list:
+        if area.get(idx, None) is not None:
+            return area[idx]
+    raise LookupError(f'No place found for {coords}')
+
+
+def _get_area(coords: Tuple, window: int) -> Optional[Text]:
+    """Returns area for the coords.
+
+    coords: Latitude and longitude of the location.
+    window: Time window in which the request is made.
+
+    Find and returns the city, town, etc. using reverse lookup via
+    OpenStreetMap. The area is looked up once per `WEATHER_TTL` seconds
+    for the same coords.
 
+    Note: The lookup is independent of the weather report, hence it is
+    run alongside the DarkSky API call in `forecast`. Returns None if the
+    lookup fails or if no place name is found for the coords.
+    """
     try:
-        # Passing Google maps API key.
-        map = Client(key=os.environ.get('CHARLOTTE_MAPS_KEY'))
-        # Finding current latitude and longitude coordinates.
-        if location:
-            curr = map.geocode(location)
-            coords = (curr[0]['geometry']['location']['lat'],
-                      curr[0]['geometry']['location']['lng'])
-        else:
-            curr = map.geolocate()
-            coords = (curr['location']['lat'],
-                      curr['location']['lng'])
-        # Reverse mapping the coordinates to find out the city name.
-        area = osm(coords, method='reverse')
-        loc_list = ['city', 'town', 'suburb', 'state', 'region', 'country']
-        for idx in loc_list:
-            if area.json.get(idx, None) is not None:
-                loc = area.json[idx]
-                break
-        return coords, loc
-    except Exception as error:
-        print('An error occured while performing this operation because of '
-              f'{error} in function "{stack()[0][3]}" on line '
-              f'{exc_info()[-1].tb_lineno}.')
-        return (None, None), None
+        return _find_area(coords, window)
+    except LookupError as error:
+        logger.debug('Could not find area for %s: %r', coords, error)
+        return None
+
+
+def _count(value: Optional[Union[int, Text]]) -> Optional[int]:
+    """Returns count of days or hours.
+
+    value: Number of days or hours, as received from the slot.
+
+    Slots can hold the missing value as `None`, `'None'`, `'null'` or an
+    empty string. Returns None for all of them as well as for the values
+    which are not numbers or are less than 1, else the value as int.
+    """
+    if value in (None, 'None', 'null', ''):
+        return None
+    try:
+        count = int(float(value))
+    except (OverflowError, TypeError, ValueError):
+        return None
+    return count if count > 0 else None
 
 
 def _wind_dir(degree: Union[float, int]) -> Text:
@@ -130,14 +304,30 @@ def _part_day() -> Text:
     starts, please have a look at `./utils/assists/constants.py` and
     change it accordingly.
     """
-    from datetime import datetime
-    from random import choice
+    return choice(_PARTS_OF_DAY[bisect_right(_HOURS_OF_DAY,
+                                             datetime.now().hour)])
+
+
+@lru_cache(maxsize=128)
+def _fetch_forecast(url: Text, window: int) -> Dict:
+    """Returns cached weather report.
+
+    url:    DarkSky API url for the requested coords & units.
+    window: Time window in which the request is made. It is part of the
+            cache key, hence the cached report expires once the window
+            changes.
+
+    Returns the weather report from `DarkSky.net`. Repeated queries for
+    the same location within `WEATHER_TTL` seconds are served from the
+    memory instead of making another API call.
 
-    hr = datetime.now().hour
-    part = choice(['morning', 'day']) if hr >= DAWN and hr < NOON else \
-        choice(['afternoon', 'day']) if hr >= NOON and hr < DUSK else \
-        'evening' if hr >= DUSK and hr < DARK else 'night'
-    return part
+    Note: The returned report is shared between the callers, hence it
+    should not be modified. Error replies from DarkSky raise an exception
+    & are never cached.
+    """
+    response = _SESSION.get(url, timeout=10.0)
+    response.raise_for_status()
+    return response.json()
 
 
 def forecast(location: Optional[Text] = None,
@@ -169,137 +359,79 @@ def forecast(location: Optional[Text] = None,
     Caution: If you run the function without passing valid API key, it
     will raise an exception.
     """
-    import os
-    from random import choice, shuffle
-    from requests import get
-
     try:
-        if check_internet():
-            (lat, lng), loc = _get_coords(location)
-            key = os.environ.get('CHARLOTTE_DSKY_KEY')
-            u, t, s = ('si', '°C', 'kph') if metric else ('us', '°F', 'mph')
-            url = f'https://api.darksky.net/forecast/{key}/' \
-                  f'{lat},{lng}?units={u}'
-            obj = get(url).json()
-            if days and days <= 7 and days > 0:
-                data, idx = obj['daily']['data'][days], 0
-                temp = str(obj['currently']['temperature']) + t
-                feel = str(obj['currently']['apparentTemperature']) + t
-                max = str(data['apparentTemperatureMax']) + t
-                min = str(data['apparentTemperatureMin']) + t
-            elif hours and hours <= 48:
-                data, idx = obj['hourly']['data'][hours], 1
-                temp = str(data['temperature']) + t
-                feel = str(data['apparentTemperature']) + t
-                max = str(obj['daily']['data'][0]['apparentTemperatureMax']) \
-                    + t
-                min = str(obj['daily']['data'][0]['apparentTemperatureMin']) \
-                    + t
-            else:
-                data, idx = obj['currently'], 2
-                temp = str(obj['currently']['temperature']) + t
-                feel = str(obj['currently']['apparentTemperature']) + t
-                max = str(obj['daily']['data'][0]['apparentTemperatureMax']) \
-                    + t
-                min = str(obj['daily']['data'][0]['apparentTemperatureMin']) \
-                    + t
-            cond = str(data['summary']).lower().strip('.')
-            if cond.startswith('possible'):
-                cond = cond.replace('possible', 'possible to have') + \
-                    ' weather'
-            if cond.startswith('rain'):
-                cond = cond.replace('rain', 'rainy weather')
-            if cond.endswith('cloudy'):
-                cond = cond + ' weather'
-            if cond.startswith('light'):
-                cond = cond.replace('light', 'possible to have light') + \
-                    ' weather'
-            if cond.startswith('heavy'):
-                cond = cond.replace('heavy', 'possible to have heavy') + \
-                    ' weather'
-            hum = str(data['humidity'] * 100) + '%'
-            spd = str(data['windSpeed']) + f' {s}'
-            fore = obj['daily']['summary']
-            cloud = data['cloudCover']
-            deg = data['windBearing']
-            sky = 'brighter' if cloud < 0.5 else 'darker'
-            dir = _wind_dir(deg)
-            part = _part_day()
-            day = resolve_days(days)
-            pl = 'day' if days == 1 else 'days'
-            _days = [f'For the next {days} {pl} there are some places in '
-                     f'{loc} that will be {cond}. Interestingly, there would '
-                     f'be {fore}',
-                     f'Well it does look as if we\'ll see more {cond} across '
-                     f'{loc} for the next {days} {pl}. More so there will be '
-                     f'{fore}',
-                     f'Some parts of {loc} will be seeing a bit of {cond} for '
-                     f'the next {days} {pl} with average temperature of {feel}'
-                     f'. But for the most part it\'ll fluctuate between {max} '
-                     f'high & {min} low.',
-                     f'Well for the next {days} {pl}, it seems it\'ll be '
-                     f'fairly {cond} in some parts of {loc}. Winds can be '
-                     f'seen gushing at speeds upto {spd} and as we go '
-                     'through the week the temperature will vary between '
-                     f'{max} high & {min} low.',
-                     f'I could see some {sky} skies over {dir} parts of {loc} '
-                     f'for the next {days} {pl}. Also we do have some {cond} '
-                     'spells with the temperature struggling to be '
-                     f'about {temp}.',
-                     f'For {day} it is forecasted that there are some places '
-                     f'in {loc} that will be {cond}. Interestingly, there '
-                     f'would be {fore}',
-                     f'Some parts of {loc} will be seeing a bit of {cond} by '
-                     f'{day} with average temperature of {feel}. But for the '
-                     f'most part it\'ll fluctuate between {max} high & '
-                     f'{min} low.',
-                     f'Well till {day}, it seems it\'ll be fairly {cond} in '
-                     f'some parts of {loc}. Winds can be seen gushing at '
-                     f'speeds upto {spd} and as we go through the week the '
-                     f'temperature will vary between {max} high & {min} low.']
-            _hrs = [f'We are going to see {cond} in the next {hours} hours '
-                    f'with {sky} skies in some parts {loc} with temperature '
-                    f'fluctuating between {max} high & {min} low.',
-                    f'There is going to be {cond} here in {loc} for the next '
-                    f'{hours} hours, also we may experience {sky} skies with '
-                    f'temperatures spiking upto {temp}.']
-            _now = [f'Well, it is {cond} in some places across much of {loc}. '
-                    f'Having said that the temperature has been around {temp} '
-                    'roughly and will stay the same for the most part of the '
-                    f'{part}.',
-                    f'It is {cond} in {dir} parts of {loc}. We will however '
-                    f'see the temperature between {min} & {max}. '
-                    f'Interestingly, there would be {fore}',
-                    f'It is {cond} across {dir} {loc} especially in the early '
-                    f'hours. It\'s the expected humidity of {hum} with the '
-                    'unsettling breeze is affecting the average temperature '
-                    f'of {feel}.',
-                    f'Looking at {loc} from above, it is {cond}. While some '
-                    f'of the areas in {dir} {loc} would get as low as {min} '
-                    f'& as high as {max} because of the humidity.',
-                    f'Well from above here, it seems it is {cond}. Winds can '
-                    f'be seen gushing at speeds upto {spd} across {loc} and '
-                    f'as we go throughout the {part} the temperature will'
-                    f' vary between {max} high & {min} low.',
-                    f'Most likely it is {cond}. However, we could see '
-                    f'temperature rise upto {temp} over the grounds of {dir} '
-                    f'parts of {loc}. Interestingly, there would be {fore}',
-                    f'In the {part} we shall witness {cond} in places across '
-                    f'{loc}. It\'s a fine start to the {part} but we\'ve got '
-                    'some windy weather which should feel relatively pleasant '
-                    f'with the temperature slightly above {temp}.',
-                    f'The temperature in {loc} is going to stay between '
-                    f'{temp} & {feel} all {part} with a bit of {cond} in the '
-                    f'{dir} parts. However, it\'ll be {fore}']
-
-            response = _days if idx == 0 else _hrs if idx == 1 else _now
-            shuffle(response)
-
-            return choice(response)
-        else:
-            # Returns None if no internet connection is available.
+        days, hours = _count(days), _count(hours)
+        # All the lookups made within the same `WEATHER_TTL` seconds share
+        # this window, hence a cached report needs no API call at all.
+        window = int(time() // WEATHER_TTL)
+        lat, lng = _get_coords(location, window)
+        # Coords are None if the Maps API could not be reached. Returns
+        # None since no internet connection is available. This saves an
+        # extra request for checking the connection before every call.
+        if lat is None:
             return None
-    except Exception as error:
-        print('An error occured while performing this operation because of '
-              f'{error} in function "{stack()[0][3]}" on line '
-              f'{exc_info()[-1].tb_lineno}.')
+        key = os.environ.get('CHARLOTTE_DSKY_KEY')
+        u, t, s = ('si', '°C', 'kph') if metric else ('us', '°F', 'mph')
+        url = f'https://api.darksky.net/forecast/{key}/' \
+              f'{lat},{lng}?units={u}&exclude=minutely,alerts,flags'
+        # Both the requests depend only on the coords, hence the reverse
+        # lookup & the weather report are requested simultaneously.
+        # The report is reused if the same url was requested within the
+        # last `WEATHER_TTL` seconds.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            area = executor.submit(_get_area, (lat, lng), window)
+            report = executor.submit(_fetch_forecast, url, window)
+            loc, obj = area.result(), report.result()
+        # Area is None if the reverse lookup failed or found no place name.
+        # Returns None instead of reporting the weather for no place.
+        if loc is None:
+            return None
+        now, daily = obj['currently'], obj['daily']
+        # `data` is the block being reported, `curr` is the one used for
+        # the temperatures & `span` for the highs and lows.
+        if days and 0 < days <= 7:
+            data, idx = daily['data'][days], 0
+            curr, span = now, data
+        elif hours and hours <= 48:
+            data, idx = obj['hourly']['data'][hours], 1
+            curr, span = data, daily['data'][0]
+        else:
+            data, idx = now, 2
+            curr, span = now, daily['data'][0]
+        temp = str(curr['temperature']) + t
+        feel = str(curr['apparentTemperature']) + t
+        max = str(span['apparentTemperatureMax']) + t
+        min = str(span['apparentTemperatureMin']) + t
+        cond = str(data['summary']).lower().strip('.')
+        if cond.startswith('possible'):
+            cond = cond.replace('possible', 'possible to have') + \
+                ' weather'
+        if cond.startswith('rain'):
+            cond = cond.replace('rain', 'rainy weather')
+        if cond.endswith('cloudy'):
+            cond = cond + ' weather'
+        if cond.startswith('light'):
+            cond = cond.replace('light', 'possible to have light') + \
+                ' weather'
+        if cond.startswith('heavy'):
+            cond = cond.replace('heavy', 'possible to have heavy') + \
+                ' weather'
+        hum = str(data['humidity'] * 100) + '%'
+        spd = str(data['windSpeed']) + f' {s}'
+        fore = daily['summary']
+        sky = 'brighter' if data['cloudCover'] < 0.5 else 'darker'
+        dir = _wind_dir(data['windBearing'])
+        part = _part_day()
+        day = resolve_days(days)
+        pl = 'day' if days == 1 else 'days'
+
+        response = _DAYS if idx == 0 else _HOURS if idx == 1 else _NOW
+        return choice(response).format(
+            loc=loc, cond=cond, temp=temp, feel=feel, max=max, min=min,
+            hum=hum, spd=spd, fore=fore, sky=sky, dir=dir, part=part,
+            day=day, days=days, hours=hours, pl=pl)
+    except (IndexError, KeyError, RequestException, ValueError) as error:
+        # Returns None if DarkSky could not be reached or if the report is
+        # not as expected.
+        logger.debug('Could not retreive the weather report: %r', error)
+        return None
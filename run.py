@@ -52,28 +52,28 @@ try:
                         user_command='Run user commands',
                         clear_screen='Clear screen',
                         exit='Exit')
-        if option is 'render_model':
+        if option == 'render_model':
             render_model()
-        elif option is 'start_training':
+        elif option == 'start_training':
             start_training()
-        elif option is 'evaluate_model':
+        elif option == 'evaluate_model':
             evaluate_model()
-        elif option is 'test_nlu':
+        elif option == 'test_nlu':
             test_nlu()
-        elif option is 'get_nlu_stats':
+        elif option == 'get_nlu_stats':
             get_nlu_stats()
-        elif option is 'start_action_server':
+        elif option == 'start_action_server':
             call(f'rasa run actions -p {ACTION_SERVER_PORT}', shell=True)
-        elif option is 'user_command':
+        elif option == 'user_command':
             option = confirm(choice(cmdline_options['user_command']))
             if option is True:
                 call(
                     answer(choice(cmdline_options['terminal_set'])), shell=True)
-        elif option is 'clear_screen':
+        elif option == 'clear_screen':
             option = confirm(choice(cmdline_options['clear_screen']))
             if option is True:
                 call('cls', shell=True)
-        elif option is 'exit':
+        elif option == 'exit':
             option = confirm(choice(cmdline_options['confirm_quit']))
             if option is True:
                 exit()
@@ -32,3 +32,5 @@ DUSK = 17
 DARK = 21
 
 ENCODING = 'utf-8'
+
+WEATHER_TTL = 300
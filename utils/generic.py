@@ -41,8 +41,11 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #   1.0.2 - Reduced unnecessary use of "`" in comments for simplicity.
 #   1.0.0 - First code.
 
+from datetime import datetime
 from typing import List, NoReturn, Optional, Text
 
+from rapidfuzz import fuzz, process
+
 
 def timestamp(format: Text) -> Text:
     """Returns timestamp.
@@ -63,8 +66,6 @@ def timestamp(format: Text) -> Text:
             * %d.%m.%Y %H:%M:%S       - 31.05.2019 01:23:45
             * %d_%m_%Y_%H_%M_%S       - 31_05_2019_01_23_45
     """
-    from datetime import datetime
-
     # datetime.now() returns current time of execution.
     return str(datetime.now().strftime(format))
 
@@ -86,7 +87,7 @@ def quit() -> NoReturn:
 
 def find_string(string: Text,
                 string_list: List,
-                min_score: Optional[int] = 70) -> Text:
+                min_score: Optional[int] = 70) -> Optional[Text]:
     """Finds string in list.
 
     string:      Approximate text that you need to find from the list.
@@ -98,16 +99,19 @@ def find_string(string: Text,
     `find_file` function but it needs to be used for searching file from
     directory while `find_string` can be used for guessing text from any
     valid list like for ex. CSV columns.
+
+    Note: If no string is given, it returns None. Callers which already
+    have a set of the list should check for the exact match themselves
+    before calling this function.
     """
-    from fuzzywuzzy.fuzz import partial_ratio
-    from fuzzywuzzy.process import extract
-
-    # This will give us list of 3 best matches for our search query.
-    guessed = extract(string, string_list, limit=3, scorer=partial_ratio)
-    for best_guess in guessed:
-        # Finding the best match whose Levenshtein score is near to 100.
-        current_score = partial_ratio(string, best_guess)
-        if current_score > min_score and current_score > 0:
-            return best_guess[0]
-        else:
-            return f'Sorry, I could not find "{string}" in given list.'
+    if string is None:
+        return None
+    # Finding the best match whose Levenshtein score is near to 100. The
+    # guesses scoring below `min_score` are skipped while matching.
+    best_guess = process.extractOne(string, string_list,
+                                    scorer=fuzz.partial_ratio,
+                                    score_cutoff=min_score)
+    if best_guess:
+        return best_guess[0]
+    else:
+        return f'Sorry, I could not find "{string}" in given list.'
@@ -28,9 +28,8 @@ At a glance, the structure of the module is following:
                         is required.
  - find_file():         Finds the matching file in the directory. This
                         function uses Fuzzy Logic for determining the
-                        best possible match. Function can provide 3 best
-                        possible matches but we use just 1 i.e. The best
-                        match.
+                        best possible match. Function returns the best
+                        match along with it`s score.
  - get_drives():        Returns the drive letter from all the valid &
                         present partitions. This assures that the user
                         does not use any drive letter which is not
@@ -53,8 +52,15 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #           connection.
 #   1.0.0 - First code.
 
+from os import makedirs, scandir
+from os.path import exists, join
+from pathlib import Path
+from time import sleep
 from typing import Any, Callable, List, NoReturn, Optional, Text, Union, Tuple
 
+import requests
+from rapidfuzz import fuzz, process
+
 from charlotte.utils.generic import find_string
 from charlotte.utils.paths import files
 
@@ -74,9 +80,6 @@ def make_dir(name: Text, init: Optional[bool] = False) -> NoReturn:
     Note: If the target directory already exists, it will skip this &
     resume with executing the rest code.
     """
-    from os import makedirs
-    from os.path import exists, join
-
     if not exists(name):
         makedirs(name)
         if init is True:
@@ -168,7 +171,6 @@ def minimize_window(window_name: Text,
     # You can find the reference code here:
     # https://stackoverflow.com/questions/25466795/how-to-minimize-a-
     # specific-window-in-python?noredirect=1&lq=1
-    from time import sleep
     from win32con import SW_MINIMIZE
     from win32gui import FindWindow, ShowWindow
 
@@ -193,31 +195,40 @@ def check_internet(timeout: Optional[Union[float, int]] = 10.0) -> bool:
     """
     # You can find the reference code here:
     # https://gist.github.com/yasinkuyu/aa505c1f4bbb4016281d7167b8fa2fc2
-    from requests import ConnectionError, get
-
     url = 'https://www.google.com/'
     try:
-        _ = get(url, timeout=timeout)
+        _ = requests.get(url, timeout=timeout)
         return True
-    except ConnectionError:
+    except requests.ConnectionError:
         return False
 
 
-def find_file(file: Text, dir_name: List) -> Tuple[Text, int]:
+def find_file(file: Text,
+              dir_name: Text,
+              min_score: Optional[int] = 70) -> Tuple[Text, int]:
     """Finds file in directory.
 
     file:      Approx. name of the file to search in the directory.
     dir_name:  Directory in which the file needs to be searched in.
-    
+    min_score: Minimum score needed to make an approximate guess.
+               Default: 70
+
     Finds the matching file in the directory. This function uses Fuzzy
     Logic for determining the best possible match.
 
-    Note: Function can provide 3 best possible matches but we use just 1
-    i.e. The best match.
+    Note: Only the files directly under the directory are searched. The
+    function returns the best match along with it`s score. If no file
+    matches, it returns a sorry message with score 0.
     """
-    from rapidfuzz import fuzz, process
-  
-    return process.extractOne(file, dir_name, scorer=fuzz.partial_ratio)[0]
+    # Listing the files from the directory in a single pass.
+    with scandir(dir_name) as entries:
+        names = [entry.name for entry in entries if entry.is_file()]
+    best_guess = process.extractOne(file, names, scorer=fuzz.partial_ratio,
+                                    score_cutoff=min_score)
+    if best_guess:
+        return best_guess[0], int(best_guess[1])
+    else:
+        return f'Sorry, I could not find "{file}" in given directory.', 0
 
 
 def get_drives(drive_letter: Text) -> Text:
@@ -229,7 +240,6 @@ def get_drives(drive_letter: Text) -> Text:
     This assures that the user does not use any drive letter which is
     not present on the system.
     """
-    from pathlib import Path
     from win32api import GetLogicalDriveStrings
 
     partitions = GetLogicalDriveStrings().split('\000')[:-1]